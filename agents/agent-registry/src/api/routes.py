@@ -4,14 +4,19 @@ Agent Registry API Routes
 FastAPI routes for the agent registry service.
 """
 
+import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime
-from fastapi import HTTPException, BackgroundTasks
+from typing import Optional, Tuple
+from fastapi import HTTPException, BackgroundTasks, Response
 
 from ..models import AgentRegistrationRequest, AgentDiscoveryResponse
 from trento_agent_sdk.a2a.models.AgentCard import AgentCard
 from ..utils.agentcard_client import fetch_agent_card
 from ..utils.mongodb_storage import MongoDBStorage
+from ..config import AGENT_LIST_CACHE_TTL
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +26,14 @@ class AgentRegistryRoutes:
 
     def __init__(self, storage: MongoDBStorage):
         self.storage = storage
+        # (timestamp, response) of the last /agents listing, cleared on every write
+        self._agents_cache: Optional[Tuple[float, AgentDiscoveryResponse]] = None
+        # Lets concurrent misses share one database read instead of each querying
+        self._agents_cache_lock = asyncio.Lock()
+
+    def _invalidate_agents_cache(self):
+        """Drop the cached listing after the set of agents has changed."""
+        self._agents_cache = None
 
     async def register_agent(
         self, request: AgentRegistrationRequest, background_tasks: BackgroundTasks
@@ -48,6 +61,7 @@ class AgentRegistryRoutes:
                     status_code=500, detail="Failed to save agent to database"
                 )
 
+            self._invalidate_agents_cache()
             logger.info(
                 f"Successfully registered agent: {agent_card.name} at {agent_card.url}"
             )
@@ -64,14 +78,57 @@ class AgentRegistryRoutes:
     async def list_agents(self) -> AgentDiscoveryResponse:
         """List all registered agents."""
         try:
-            agents = await self.storage.list_agents()
-            return AgentDiscoveryResponse(agents=agents, total_count=len(agents))
+            async with self._agents_cache_lock:
+                if (
+                    self._agents_cache is not None
+                    and time.monotonic() - self._agents_cache[0] < AGENT_LIST_CACHE_TTL
+                ):
+                    return self._agents_cache[1]
+
+                agents = await self.storage.list_agents()
+                response = AgentDiscoveryResponse(
+                    agents=agents, total_count=len(agents)
+                )
+                self._agents_cache = (time.monotonic(), response)
+                return response
         except Exception as e:
             logger.error(f"Error listing agents: {e}")
             raise HTTPException(
                 status_code=500, detail=f"Failed to list agents: {str(e)}"
             )
 
+    async def discover_agents(
+        self, fields: Optional[str] = None, if_none_match: Optional[str] = None
+    ) -> Response:
+        """List registered agents, optionally trimmed to some AgentCard fields.
+
+        The response carries an ETag so clients polling /agents get an empty 304
+        while the listing is unchanged.
+        """
+        listing = await self.list_agents()
+
+        include = None
+        if fields:
+            wanted = {name.strip() for name in fields.split(",") if name.strip()}
+            unknown = wanted - AgentCard.model_fields.keys()
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown AgentCard fields: {', '.join(sorted(unknown))}",
+                )
+            include = {"agents": {"__all__": wanted}, "total_count": True}
+
+        # Pydantic serializes (and projects) straight to JSON bytes
+        body = listing.model_dump_json(include=include).encode("utf-8")
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={int(AGENT_LIST_CACHE_TTL)}",
+        }
+        if if_none_match == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
     async def get_agent(self, agent_url: str) -> AgentCard:
         """Get specific agent information by URL."""
         agent = await self.storage.get_agent(agent_url)
@@ -94,6 +151,7 @@ class AgentRegistryRoutes:
                 status_code=500, detail="Failed to delete agent from database"
             )
 
+        self._invalidate_agents_cache()
         logger.info(f"Unregistered agent: {agent_url}")
         return {"message": f"Agent {agent_url} unregistered successfully"}
 
@@ -119,6 +177,7 @@ class AgentRegistryRoutes:
                         status_code=500, detail="Failed to update agent in database"
                     )
 
+                self._invalidate_agents_cache()
                 logger.info(f"Refreshed AgentCard for {agent_url}")
                 return {"message": f"AgentCard refreshed for {agent_url}"}
             else:
@@ -149,9 +208,9 @@ class AgentRegistryRoutes:
             "endpoints": {
                 "register": "POST /register (with {url: 'agent_base_url'})",
                 "list_agents": "GET /agents",
-                "get_agent": "GET /agents/{agent_url}",
-                "unregister": "DELETE /agents/{agent_url}",
-                "refresh": "POST /refresh/{agent_url}",
+                "get_agent": "GET /agents/by-url?url={agent_url}",
+                "unregister": "DELETE /agents/by-url?url={agent_url}",
+                "refresh": "POST /refresh?url={agent_url}",
             },
             "total_agents": total_agents,
         }
@@ -15,6 +15,17 @@ MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "agent_registry")
 MONGODB_COLLECTION = os.getenv("MONGODB_COLLECTION", "agents")
 
+# MongoDB connection pool; the minimum is kept open so bursts of requests do not
+# wait on new connections
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+
+# Seconds an AgentCard read from MongoDB is served from memory
+AGENT_CACHE_TTL = float(os.getenv("AGENT_CACHE_TTL", "30"))
+
+# Seconds a cached /agents listing is served before MongoDB is queried again
+AGENT_LIST_CACHE_TTL = float(os.getenv("AGENT_LIST_CACHE_TTL", "5"))
+
 # Server configuration
 REGISTRY_HOST = os.getenv("HOST", "0.0.0.0")
 REGISTRY_PORT = int(os.getenv("PORT", "8080"))
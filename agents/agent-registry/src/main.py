@@ -11,7 +11,8 @@ This service provides:
 
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, BackgroundTasks
+from typing import Optional
+from fastapi import FastAPI, BackgroundTasks, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
@@ -76,10 +77,39 @@ def create_app():
         return await routes_handler.register_agent(request, background_tasks)
 
     @app.get("/agents", response_model=AgentDiscoveryResponse)
-    async def list_agents():
+    async def list_agents(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated AgentCard fields to return"
+        ),
+        if_none_match: Optional[str] = Header(None),
+    ):
         """List all registered agents."""
-        return await routes_handler.list_agents()
+        return await routes_handler.discover_agents(fields, if_none_match)
+
+    # Lookups by URL take it as a query parameter; these routes are declared before
+    # the legacy path-parameter routes so "/agents/by-url" is not read as a URL
+    @app.get("/agents/by-url", response_model=AgentCard)
+    async def get_agent_by_url(url: str = Query(..., description="Agent base URL")):
+        """Get specific agent information by URL."""
+        return await routes_handler.get_agent(url)
+
+    @app.delete("/agents/by-url")
+    async def unregister_agent_by_url(
+        background_tasks: BackgroundTasks,
+        url: str = Query(..., description="Agent base URL"),
+    ):
+        """Unregister an agent."""
+        return await routes_handler.unregister_agent(url, background_tasks)
+
+    @app.post("/refresh")
+    async def refresh_agent_card_by_url(
+        background_tasks: BackgroundTasks,
+        url: str = Query(..., description="Agent base URL"),
+    ):
+        """Refresh AgentCard data for a specific agent."""
+        return await routes_handler.refresh_agent_card(url, background_tasks)
 
+    # Legacy routes embedding the agent URL in the path, kept for existing clients
     @app.get("/agents/{agent_url:path}", response_model=AgentCard)
     async def get_agent(agent_url: str):
         """Get specific agent information by URL."""
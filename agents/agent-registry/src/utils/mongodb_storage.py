@@ -4,44 +4,107 @@ MongoDB Storage
 MongoDB-based storage implementation for agent registry using AgentCard with URL as identifier.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-from motor.motor_asyncio import (
-    AsyncIOMotorClient,
-    AsyncIOMotorDatabase,
-    AsyncIOMotorCollection,
-)
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pymongo import AsyncMongoClient, ReplaceOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
 
 from trento_agent_sdk.a2a.models.AgentCard import AgentCard
-from ..config import MONGODB_URI, MONGODB_DATABASE, MONGODB_COLLECTION
+from ..config import (
+    MONGODB_URI,
+    MONGODB_DATABASE,
+    MONGODB_COLLECTION,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_MAX_POOL_SIZE,
+    AGENT_CACHE_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
+# Leave MongoDB's _id out of every read; AgentCard has no field for it
+AGENT_PROJECTION = {"_id": 0}
+
+# One connection pool per process, shared by every connected MongoDBStorage and
+# closed when the last of them disconnects
+_client: Optional[AsyncMongoClient] = None
+_client_users = 0
+_client_lock = asyncio.Lock()
+
+
+async def _acquire_client() -> AsyncMongoClient:
+    """Returns the shared client, creating it for the first user."""
+    global _client, _client_users
+    async with _client_lock:
+        if _client is None:
+            # Native asyncio driver: queries run on the event loop rather than
+            # being handed to a thread pool as Motor does
+            _client = AsyncMongoClient(
+                MONGODB_URI,
+                minPoolSize=MONGODB_MIN_POOL_SIZE,
+                maxPoolSize=MONGODB_MAX_POOL_SIZE,
+                maxIdleTimeMS=60000,
+                serverSelectionTimeoutMS=5000,
+            )
+        _client_users += 1
+        return _client
+
+
+async def _release_client():
+    """Closes the shared client once its last user has released it."""
+    global _client, _client_users
+    async with _client_lock:
+        _client_users -= 1
+        if _client_users == 0 and _client is not None:
+            await _client.close()
+            _client = None
+
 
 class MongoDBStorage:
     """MongoDB storage implementation for agent registry."""
 
     def __init__(self):
-        self.client: Optional[AsyncIOMotorClient] = None
-        self.database: Optional[AsyncIOMotorDatabase] = None
-        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.client: Optional[AsyncMongoClient] = None
+        self.database: Optional[AsyncDatabase] = None
+        self.collection: Optional[AsyncCollection] = None
+        # url -> (timestamp, AgentCard); entries are dropped on every write
+        self._cache: Dict[str, Tuple[float, AgentCard]] = {}
 
     async def connect(self):
         """Connect to MongoDB."""
+        logger.info(f"Connecting to MongoDB at {MONGODB_URI}")
+        client = await _acquire_client()
         try:
-            logger.info(f"Connecting to MongoDB at {MONGODB_URI}")
-            self.client = AsyncIOMotorClient(MONGODB_URI)
+            self.client = client
             self.database = self.client[MONGODB_DATABASE]
             self.collection = self.database[MONGODB_COLLECTION]
             logger.info("Connected to MongoDB successfully")
+            await self._ensure_indexes()
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
+            # Give the shared client back so it is closed with its last user
+            self.client = None
+            await _release_client()
             raise
 
+    async def _ensure_indexes(self):
+        """Index the URL every lookup, update and delete filters on."""
+        try:
+            await self.collection.create_index("url", unique=True)
+        except PyMongoError as e:
+            # An unreachable server, an existing index with other options or
+            # duplicate URLs left by older versions must not keep the registry
+            # from starting; the client connects lazily once MongoDB is back
+            logger.warning(f"Could not create unique index on url: {e}")
+
     async def disconnect(self):
         """Disconnect from MongoDB."""
         if self.client:
-            self.client.close()
+            self.client = None
+            await _release_client()
             logger.info("Disconnected from MongoDB")
 
     async def save_agent(self, agent_card: AgentCard) -> bool:
@@ -49,40 +112,64 @@ class MongoDBStorage:
         try:
             # Use URL as the unique identifier
             await self.collection.replace_one(
-                {"url": agent_card.url}, agent_card.dict(), upsert=True
+                {"url": agent_card.url}, agent_card.model_dump(), upsert=True
             )
+            self._cache.pop(agent_card.url, None)
             logger.info(f"Saved agent: {agent_card.name} at {agent_card.url}")
             return True
         except Exception as e:
             logger.error(f"Failed to save agent: {e}")
             return False
 
+    async def save_agents_bulk(self, agent_cards: List[AgentCard]) -> bool:
+        """Save several agents (create or update) in a single round-trip."""
+        if not agent_cards:
+            return True
+        try:
+            operations = [
+                ReplaceOne({"url": card.url}, card.model_dump(), upsert=True)
+                for card in agent_cards
+            ]
+            # Unordered, so one failing write does not stop the rest of the batch
+            await self.collection.bulk_write(operations, ordered=False)
+            for card in agent_cards:
+                self._cache.pop(card.url, None)
+            logger.info(f"Saved {len(agent_cards)} agents")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save agents: {e}")
+            return False
+
     async def get_agent(self, agent_url: str) -> Optional[AgentCard]:
         """Get agent information by URL."""
+        cached = self._cache.get(agent_url)
+        if cached is not None and time.monotonic() - cached[0] < AGENT_CACHE_TTL:
+            return cached[1]
+
         try:
-            document = await self.collection.find_one({"url": agent_url})
+            document = await self.collection.find_one(
+                {"url": agent_url}, AGENT_PROJECTION
+            )
             if document:
-                # Remove MongoDB's _id field if present
-                document.pop("_id", None)
                 agent_card = AgentCard(**document)
+                self._cache[agent_url] = (time.monotonic(), agent_card)
                 return agent_card
             return None
         except Exception as e:
             logger.error(f"Failed to get agent {agent_url}: {e}")
             return None
 
+    async def iter_agents(self) -> AsyncIterator[AgentCard]:
+        """Yield registered agents as the cursor returns them."""
+        async for document in self.collection.find({}, AGENT_PROJECTION):
+            yield AgentCard(**document)
+
     async def list_agents(self) -> List[AgentCard]:
         """List all registered agents."""
         try:
-            cursor = self.collection.find({})
-            documents = await cursor.to_list(length=None)
-
-            # Remove MongoDB's _id field from each document
-            for doc in documents:
-                doc.pop("_id", None)
-
-            agent_cards = [AgentCard(**doc) for doc in documents]
-            return agent_cards
+            # Each batch is turned into AgentCards as it arrives instead of holding
+            # every raw document and every card in memory at the same time
+            return [agent_card async for agent_card in self.iter_agents()]
         except Exception as e:
             logger.error(f"Failed to list agents: {e}")
             return []
@@ -91,6 +178,7 @@ class MongoDBStorage:
         """Unregister (delete) an agent from MongoDB."""
         try:
             result = await self.collection.delete_one({"url": agent_url})
+            self._cache.pop(agent_url, None)
             if result.deleted_count > 0:
                 logger.info(f"Unregistered agent: {agent_url}")
                 return True
@@ -252,22 +252,15 @@ if __name__ == "__main__":
         logger.info(f"Starting Drive Organizer A2A Server on http://{HOST}:{PORT}")
         # Use uvicorn server for better performance in production
         if ENVIRONMENT == "production" and int(os.getenv("WORKER_COUNT", "4")) > 1:
-            # For production with multiple workers, use the import string
-            import subprocess
-
-            subprocess.run(
-                [
-                    "uvicorn",
-                    "drive_organizer_a2a_server:app",
-                    "--host",
-                    "0.0.0.0",
-                    "--port",
-                    str(PORT),
-                    "--log-level",
-                    "info",
-                    "--workers",
-                    os.getenv("WORKER_COUNT", "4"),
-                ]
+            # For production with multiple workers, use the import string; uvicorn
+            # supervises the workers itself instead of going through a uvicorn
+            # executable found on PATH
+            uvicorn.run(
+                "drive_organizer_a2a_server:app",
+                host="0.0.0.0",
+                port=PORT,
+                log_level="info",
+                workers=int(os.getenv("WORKER_COUNT", "4")),
             )
         else:
             # For development or single worker, we can use the app instance
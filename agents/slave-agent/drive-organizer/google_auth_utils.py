@@ -4,7 +4,10 @@ This module provides common functions for handling Google OAuth credentials and
 """
 
 import os
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Dict, Any
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -14,6 +17,24 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# OAuth client of the service, read once; .env has already been loaded above
+GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
+GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
+
+# Credentials per user refresh token. Google refreshes a Credentials object in
+# place, so keeping it lets the next tool call reuse a refreshed access token
+# instead of starting from the stale one stored with the user and refreshing again.
+# Only refreshable credentials are kept, and the least recently used user is
+# evicted once CREDENTIALS_CACHE_SIZE users are cached.
+CREDENTIALS_CACHE_SIZE = int(os.getenv("CREDENTIALS_CACHE_SIZE", "256"))
+_credentials_cache: "OrderedDict[str, Credentials]" = OrderedDict()
+_credentials_lock = threading.Lock()
+
+
+def _credentials_cache_key(refresh_token: str) -> str:
+    """Returns the cache key for a refresh token without keeping the raw token."""
+    return hashlib.blake2b(refresh_token.encode("utf-8"), digest_size=16).hexdigest()
+
 
 def create_and_refresh_credentials(google_tokens: Dict[str, Any]) -> Credentials:
     """Create Google credentials and refresh if needed.
@@ -29,13 +50,11 @@ def create_and_refresh_credentials(google_tokens: Dict[str, Any]) -> Credentials
         RefreshError: If token refresh fails
     """
     # Log available token keys for debugging (without sensitive values)
-    logger.debug(f"Available token keys: {list(google_tokens.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Available token keys: {list(google_tokens.keys())}")
     
     # Validate required credentials
-    client_id = os.environ.get("GOOGLE_CLIENT_ID")
-    client_secret = os.environ.get("GOOGLE_CLIENT_SECRET")
-    
-    if not client_id or not client_secret:
+    if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
         logger.error("Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET environment variables")
         raise ValueError("Google OAuth client credentials not configured")
     
@@ -43,14 +62,30 @@ def create_and_refresh_credentials(google_tokens: Dict[str, Any]) -> Credentials
         logger.error("No access token found in user credentials")
         raise ValueError("No access token available")
     
-    credentials = Credentials(
-        token=google_tokens.get("access_token"),
-        refresh_token=google_tokens.get("refresh_token"),
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=client_id,
-        client_secret=client_secret,
-        scopes=["https://www.googleapis.com/auth/drive"],
-    )
+    # Credentials without a refresh token can never be refreshed, so caching
+    # them would gain nothing; they are built fresh on every call
+    refresh_token = google_tokens.get("refresh_token")
+    cache_key = _credentials_cache_key(refresh_token) if refresh_token else None
+    credentials = None
+    if cache_key is not None:
+        with _credentials_lock:
+            credentials = _credentials_cache.get(cache_key)
+            if credentials is not None:
+                _credentials_cache.move_to_end(cache_key)
+    if credentials is None:
+        credentials = Credentials(
+            token=google_tokens.get("access_token"),
+            refresh_token=refresh_token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=GOOGLE_CLIENT_ID,
+            client_secret=GOOGLE_CLIENT_SECRET,
+            scopes=["https://www.googleapis.com/auth/drive"],
+        )
+        if cache_key is not None:
+            with _credentials_lock:
+                _credentials_cache[cache_key] = credentials
+                while len(_credentials_cache) > CREDENTIALS_CACHE_SIZE:
+                    _credentials_cache.popitem(last=False)
     
     # Check if credentials are expired and refresh if needed
     if credentials.expired and credentials.refresh_token:
@@ -60,6 +95,8 @@ def create_and_refresh_credentials(google_tokens: Dict[str, Any]) -> Credentials
             logger.info("Token refreshed successfully")
         except RefreshError as e:
             logger.error(f"Failed to refresh token: {e}")
+            with _credentials_lock:
+                _credentials_cache.pop(cache_key, None)
             # Provide more specific error message based on the error
             if "invalid_client" in str(e):
                 raise RefreshError(f"Invalid client credentials. Please check GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET: {e}")
@@ -92,5 +129,6 @@ def validate_google_tokens(google_tokens: Dict[str, Any]) -> bool:
             logger.warning(f"Missing required token field: {field}")
             return False
     
-    logger.debug(f"Google tokens validation passed. Available fields: {list(google_tokens.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Google tokens validation passed. Available fields: {list(google_tokens.keys())}")
     return True
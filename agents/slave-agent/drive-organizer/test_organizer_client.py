@@ -9,14 +9,6 @@ async def main():
         "https://drive-organizer-595073969012.europe-west8.run.app"  # Update with your deployment URL in production
         # "http://localhost:8002",  # Use this for local testing
     ) as client:
-        # Get the agent card to see what the agent can do
-        agent_card = await client.get_agent_card()
-        print(f"Connected to agent: {agent_card.name}")
-        print(f"Description: {agent_card.description}")
-
-        # Send an organization task to the agent
-        print("\nSending folder organization task to the agent...")
-
         # Example course name and user ID
         course_name = "deep-learning"  # Using course name instead of folder ID
         user_id = "111369155660754322920"
@@ -27,8 +19,14 @@ async def main():
         # Add debug info
         print(f"Task: {task_text}")
 
-        # Set debug mode to true to get detailed task execution
-        response = await client.send_task(task_text)
+        # Fetch the agent card and send the organization task concurrently, so
+        # the two round-trips overlap instead of running one after the other
+        print("\nSending folder organization task to the agent...")
+        agent_card, response = await asyncio.gather(
+            client.get_agent_card(), client.send_task(task_text)
+        )
+        print(f"Connected to agent: {agent_card.name}")
+        print(f"Description: {agent_card.description}")
 
         # Access the result attribute
         task_id = response.result.id
@@ -13,6 +13,11 @@ MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGO_DB_NAME = os.getenv("MONGODB_DB_NAME", "drive_documents")
 COLLECTION_NAME = os.getenv("MONGODB_COLLECTION", "processed_files")
 
+# Shared client, created once: connection errors surface on the first query and
+# fail fast instead of waiting out the default 30 second server selection
+mongo_client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+documents_collection = mongo_client[MONGO_DB_NAME][COLLECTION_NAME]
+
 
 async def fetch_document_content(document_id: str) -> Dict[str, Any]:
     """
@@ -29,16 +34,11 @@ async def fetch_document_content(document_id: str) -> Dict[str, Any]:
         description: Retrieves document content from MongoDB by Google Drive file ID
     """
     try:
-        # Connect to MongoDB
-        client = MongoClient(MONGO_URI)
-        db = client[MONGO_DB_NAME]
-        collection = db[COLLECTION_NAME]
-
-        # Find document by Google Drive ID
-        document = collection.find_one({"google_document_id": document_id})
-
-        # Close MongoDB connection
-        client.close()
+        # Find document by Google Drive ID, reading back only the returned fields
+        document = documents_collection.find_one(
+            {"google_document_id": document_id},
+            {"_id": 0, "content": 1, "file_name": 1},
+        )
 
         if not document:
             logger.error(f"Document with ID {document_id} not found")
@@ -3,18 +3,15 @@ import logging
 import os
 import json
 from dotenv import load_dotenv
-import openai
 import datetime
 
+from .llm_client import client
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Get API configuration from environment
-API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY")
+# Get model configuration from environment
 MODEL = os.getenv("MODEL", "gemini-2.0-flash")
-BASE_URL = os.getenv(
-    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
-)
 
 
 async def format_exam(
@@ -45,9 +42,6 @@ async def format_exam(
                 "formatted_exam": None,
             }
 
-        # Initialize OpenAI client with API key and base URL
-        client = openai.OpenAI(api_key=API_KEY, base_url=BASE_URL)
-
         # Create a prompt for the model
         current_date = datetime.datetime.now().strftime("%Y-%m-%d")
         prompt = f"""
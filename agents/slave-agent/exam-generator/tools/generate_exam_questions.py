@@ -3,17 +3,14 @@ import logging
 import os
 import json
 from dotenv import load_dotenv
-import openai
+
+from .llm_client import client
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Get API configuration from environment
-API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY")
+# Get model configuration from environment
 MODEL = os.getenv("MODEL", "gemini-2.0-flash")
-BASE_URL = os.getenv(
-    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
-)
 
 
 async def generate_exam_questions(
@@ -60,9 +57,6 @@ async def generate_exam_questions(
                     "exam": None,
                 }
 
-        # Initialize OpenAI client with API key and base URL
-        client = openai.OpenAI(api_key=API_KEY, base_url=BASE_URL)
-
         # Check if we need to access the exam_structure directly or through its 'exam_structure' property
         if "exam_structure" in exam_structure and isinstance(
             exam_structure["exam_structure"], dict
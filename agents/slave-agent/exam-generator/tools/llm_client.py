@@ -0,0 +1,25 @@
+"""
+Shared LLM client for the exam generator tools
+"""
+import os
+import httpx
+import openai
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Get API configuration from environment
+API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY")
+BASE_URL = os.getenv(
+    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
+)
+
+# One pooled HTTP/2 connection shared by every tool, so consecutive calls reuse a
+# warm connection instead of building a new client and TLS session each time
+http_client = openai.DefaultHttpxClient(
+    http2=True,
+    timeout=httpx.Timeout(60.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+client = openai.OpenAI(api_key=API_KEY, base_url=BASE_URL, http_client=http_client)
@@ -41,6 +41,27 @@ class Embedder:
         )
         return result.embeddings[0].values
 
+    def embed_batch(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
+        """
+        Embed several texts with one API call per batch instead of one per text.
+        
+        Args:
+            texts (List[str]): The texts to be embedded.
+            batch_size (int): Maximum number of texts sent in a single request.
+            
+        Returns:
+            List[List[float]]: One vector per input text, in the same order.
+        """
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            result = self.embedding_client.models.embed_content(
+                model="models/text-embedding-004",
+                contents=texts[start:start + batch_size],
+                config=types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY"),
+            )
+            vectors.extend(embedding.values for embedding in result.embeddings)
+        return vectors
+
 
 class RAG:
     """
@@ -62,7 +83,7 @@ class RAG:
         }
         self.user_id = user_id
         self.collection_name = self._get_or_create_user_collection()
-        print("RAG_COLLECTION_NAME:", self.collection_name)
+        logger.debug("RAG collection name: %s", self.collection_name)
         self.embedder = Embedder()
 
     def _get_or_create_user_collection(self) -> str:
@@ -127,13 +148,14 @@ class RAG:
         """
         try:
             chunks = chunk_text(text)
+            vectors = self.embedder.embed_batch(chunks)
             points = []
-            for chunk in chunks:
+            for chunk, vector in zip(chunks, vectors):
                 pid = uuid4().hex
                 points.append(
                     {
                         "id": pid,
-                        "vector": self.embedder.embed(chunk),
+                        "vector": vector,
                         "payload": {
                             "user_id": self.user_id,
                             "page_content": chunk,
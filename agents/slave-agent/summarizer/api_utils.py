@@ -1,7 +1,18 @@
 import time
+import random
+import asyncio
 import logging
 import json
-from typing import Any, Callable, Dict, Optional, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -62,6 +73,89 @@ def retry_api_call(
     raise Exception("All retries failed without a specific exception")
 
 
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the Retry-After header from a failed API response, if there is one.
+
+    Args:
+        error: The exception raised by the API client
+
+    Returns:
+        The number of seconds the server asked us to wait, or None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def async_retry_api_call(
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    max_retries: int = 3,
+    initial_delay: float = 1.0,
+    backoff_factor: float = 2.0,
+    max_delay: float = 30.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    **kwargs: Any,
+) -> T:
+    """
+    Execute an async API call with retry logic.
+
+    The coroutine is awaited inside the retry loop, so errors raised by the call
+    itself are retried. A Retry-After header on the failed response takes
+    precedence over the exponential backoff, and a small random jitter keeps
+    concurrent callers from retrying in lockstep.
+
+    Args:
+        func: The coroutine function to call
+        *args: Positional arguments to pass to the function
+        max_retries: Maximum number of retries
+        initial_delay: Initial delay in seconds before retrying
+        backoff_factor: Factor by which the delay increases with each retry
+        max_delay: Upper bound in seconds for a single wait
+        retry_on: Exception types that should trigger a retry
+        **kwargs: Keyword arguments to pass to the function
+
+    Returns:
+        The result of the awaited function call
+
+    Raises:
+        Exception: The last exception encountered if all retries fail
+    """
+    delay = initial_delay
+
+    for attempt in range(max_retries):
+        try:
+            return await func(*args, **kwargs)
+        except retry_on as e:
+            logger.warning(
+                f"API call failed (attempt {attempt + 1}/{max_retries}): {str(e)}"
+            )
+
+            # If we've exhausted our retries, raise the last exception
+            if attempt == max_retries - 1:
+                logger.error(f"All {max_retries} attempts failed: {str(e)}")
+                raise
+
+            # Honour the server's Retry-After hint, otherwise back off exponentially
+            wait = _retry_after_seconds(e)
+            if wait is None:
+                wait = delay * random.uniform(1.0, 1.5)
+            wait = min(wait, max_delay)
+
+            logger.info(f"Retrying in {wait:.1f} seconds...")
+            await asyncio.sleep(wait)
+            delay *= backoff_factor
+
+    raise Exception("All retries failed without a specific exception")
+
+
 def safe_json_parse(
     json_str: str, default_value: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
@@ -75,12 +169,13 @@ def safe_json_parse(
     Returns:
         Parsed JSON object or default value
     """
-    if not json_str or not json_str.strip():
+    # isspace() tests for blank input without copying the string via strip()
+    if not json_str or json_str.isspace():
         logger.warning("Empty JSON string received")
         return default_value or {}
 
     try:
         return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parse error: {str(e)}, content: {json_str[:100]}...")
+    except ValueError as e:  # JSONDecodeError is a ValueError subclass
+        logger.error("JSON parse error: %s, content: %.100s...", e, json_str)
         return default_value or {}
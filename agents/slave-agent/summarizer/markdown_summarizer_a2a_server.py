@@ -21,8 +21,12 @@ from trento_agent_sdk.tool.tool_manager import ToolManager
 from api_utils import retry_api_call
 
 # Import Markdown Summarizer tools
-from tools.chunk_markdown.chunk_markdown import chunk_markdown
+from tools.chunk_markdown.chunk_markdown import (
+    chunk_markdown_async,
+    shutdown_chunk_pool,
+)
 from tools.summarize_chunk.summarize_chunk import summarize_chunk
+from tools.summarize_chunks.summarize_chunks import summarize_chunks
 from tools.format_summary.format_summary import format_summary
 from tools.fetch_markdown_content.fetch_markdown_content import fetch_markdown_content
 from trento_agent_sdk.memory.memory import LongMemory
@@ -75,6 +79,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown: cleanup and close resources
     logger.info("Shutting down Markdown Summarizer A2A Server")
+    shutdown_chunk_pool()
 
 
 # Create FastAPI app with lifespan management (Copied from first)
@@ -99,8 +104,9 @@ try:
     tool_manager = ToolManager()
 
     # Register markdown summarization tools
-    tool_manager.add_tool(chunk_markdown)
+    tool_manager.add_tool(chunk_markdown_async)
     tool_manager.add_tool(summarize_chunk)
+    tool_manager.add_tool(summarize_chunks)
     tool_manager.add_tool(format_summary)
     tool_manager.add_tool(fetch_markdown_content)
 
@@ -136,16 +142,9 @@ memory_prompt = (
 base_memory = LongMemory(user_id="test_user", memory_prompt=memory_prompt)
 
 
-logger.info(
-    f"Initializing Markdown Summarizer Agent with model {MODEL}"
-)  # Changed message
-
-try:
-    # Initialize the agent with retry mechanism
-    def create_agent():
-        return Agent(
-            name="Markdown Summarizer Agent",
-            system_prompt="""You are a Markdown Summarizer Agent that processes documents through a specific workflow.
+# System prompt sent on every agent turn; kept free of redundant whitespace since
+# every character is billed again on each turn
+SYSTEM_PROMPT = """You are a Markdown Summarizer Agent that processes documents through a specific workflow.
 
 CRITICAL RULES:
 1. NEVER include large content in your responses - always keep responses brief
@@ -154,14 +153,26 @@ CRITICAL RULES:
 4. Follow this exact sequence: fetch → chunk → summarize → format
 
 WORKFLOW:
-- If given document ID → call fetch_markdown_content 
+- If given document ID → call fetch_markdown_content
 - After ANY content is fetched → IMMEDIATELY call chunk_markdown
-- For each chunk → call summarize_chunk with specified style
+- Pass ALL chunks to summarize_chunks in a single call with specified style (use summarize_chunk only for a single chunk)
 - Finally → call format_summary to combine all summaries
 
 Available styles: technical, bullet-points, standard, concise, detailed (default: standard)
 
-Always respond with brief status updates, never include document content in responses.""",
+Always respond with brief status updates, never include document content in responses."""
+
+logger.info(
+    f"Initializing Markdown Summarizer Agent with model {MODEL}"
+)  # Changed message
+logger.info(f"System prompt size: ~{len(SYSTEM_PROMPT) // 4} tokens")
+
+try:
+    # Initialize the agent with retry mechanism
+    def create_agent():
+        return Agent(
+            name="Markdown Summarizer Agent",
+            system_prompt=SYSTEM_PROMPT,
             tool_manager=tool_manager,
             model=MODEL,
             api_key=API_KEY,
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The summarizer imports its modules relative to the service directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -0,0 +1,29 @@
+import asyncio
+
+from tools.summarize_chunks import summarize_chunks as module
+
+
+def _run_with_fake_llm(monkeypatch, chunks):
+    groups = []
+
+    async def fake_summarize_group(group, style):
+        groups.append(group)
+        return [{"success": True, "summary": f"summary of {chunk}"} for chunk in group]
+
+    monkeypatch.setattr(module, "_summarize_group", fake_summarize_group)
+    monkeypatch.setattr(module, "get_cached_summary", lambda key: None)
+    return asyncio.run(module.summarize_chunks(chunks)), groups
+
+
+def test_plain_string_is_a_single_chunk(monkeypatch):
+    result, groups = _run_with_fake_llm(monkeypatch, "A single sentence to summarize.")
+
+    assert groups == [["A single sentence to summarize."]]
+    assert result["summaries"] == ["summary of A single sentence to summarize."]
+
+
+def test_json_array_string_is_parsed(monkeypatch):
+    result, groups = _run_with_fake_llm(monkeypatch, '["# One", "# Two"]')
+
+    assert sorted(chunk for group in groups for chunk in group) == ["# One", "# Two"]
+    assert result["summaries"] == ["summary of # One", "summary of # Two"]
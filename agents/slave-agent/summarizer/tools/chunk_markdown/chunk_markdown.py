@@ -1,26 +1,88 @@
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+import asyncio
+import functools
 import logging
-import re
-import sys
+import multiprocessing
 import os
+import re
 
-# Add the parent directory to the path to import utils
-sys.path.append(os.path.dirname(__file__) + "/..")
-from utils import sanitize_content
+from tools.utils import CHARS_PER_TOKEN, sanitize_content
 
 logger = logging.getLogger(__name__)
 
+# Split patterns, compiled once at import instead of looked up on every call
+PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+HEADING_RE = re.compile(r'(#{1,6})\s+\S')
+FENCE_RE = re.compile(r'^[ ]{0,3}(`{3,}|~{3,})', re.MULTILINE)
+
+# Documents longer than this many characters are chunked in a worker process, so
+# the event loop keeps serving other requests while a very large file is split
+PROCESS_POOL_THRESHOLD = int(os.getenv("CHUNK_PROCESS_THRESHOLD", "500000"))
+
+# Created on the first large document and closed by shutdown_chunk_pool()
+_chunk_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _update_fence(paragraph: str, open_fence: Optional[str]) -> Optional[str]:
+    """
+    Tracks whether the text after a paragraph is inside a fenced code block.
+
+    Args:
+        paragraph: The paragraph just scanned
+        open_fence: The fence opened before the paragraph, or None outside code
+
+    Returns:
+        Optional[str]: The fence still open after the paragraph, or None
+    """
+    for match in FENCE_RE.finditer(paragraph):
+        fence = match.group(1)
+        if open_fence is None:
+            open_fence = fence
+        elif fence[0] == open_fence[0] and len(fence) >= len(open_fence):
+            open_fence = None
+    return open_fence
+
 
-async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
+def _add_heading_context(body: str, trail: tuple) -> str:
+    """
+    Prefixes a chunk with the headings it belongs to.
+
+    Args:
+        body: The chunk text
+        trail: Heading lines enclosing the chunk, outermost first
+
+    Returns:
+        str: The chunk preceded by its heading trail, without repeating a heading
+        the chunk already starts with
+    """
+    if trail:
+        last = trail[-1]
+        if body.startswith(last) and body[len(last):len(last) + 1] in ("", "\n"):
+            trail = trail[:-1]
+    if not trail:
+        return body
+    return "\n".join(trail) + "\n\n" + body
+
+
+def chunk_markdown(
+    content: str, chunk_size: int = 800, token_limit: int = 0
+) -> Dict[str, Any]:
     """
     Splits a markdown document into smaller chunks.
 
     This function attempts to intelligently chunk the document by preserving
-    the structure of headings, paragraphs, and other markdown elements.
+    the structure of headings, paragraphs, and other markdown elements. Every
+    chunk is prefixed with the headings of the section it comes from, so it
+    keeps its context when summarized on its own.
 
     Args:
         content: The markdown content to be chunked
-        chunk_size: Maximum size of each chunk in characters (default: 800)
+        chunk_size: Maximum size of each chunk in characters, not counting the
+            heading prefix (default: 800)
+        token_limit: Optional maximum size of each chunk in LLM tokens; when set it
+            takes precedence over chunk_size
 
     Returns:
         Dict containing a list of markdown chunks
@@ -38,6 +100,10 @@ async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
                     type: integer
                     description: Maximum size of each chunk in characters
                     default: 800
+                token_limit:
+                    type: integer
+                    description: Optional maximum size of each chunk in tokens, overrides chunk_size when set
+                    default: 0
             required:
                 - content
         output_schema:
@@ -58,6 +124,11 @@ async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
     try:
         logger.info(f"Chunking markdown content of size {len(content)}")
 
+        # The chunks are sized for the summarization model, so a token limit is
+        # turned into characters with the same estimate used to pack LLM batches
+        if token_limit and token_limit > 0:
+            chunk_size = token_limit * CHARS_PER_TOKEN
+
         # Validate input content
         if not content or not content.strip():
             logger.warning("Empty or None content provided to chunk_markdown")
@@ -87,53 +158,96 @@ async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
             }
 
         # Simple chunking approach - split by paragraphs first, then by sentences if needed
+        # Chunks are built as lists of parts with a running length and joined only
+        # when flushed, so each paragraph is copied once instead of on every append
         chunks = []
-        current_chunk = ""
-        
+        current_parts = []  # paragraphs of the chunk being built
+        current_len = 0  # length of the chunk once its parts are joined
+
+        # Headings enclosing the current paragraph as (level, line), outermost first.
+        # A snapshot of their lines is taken when a chunk starts and prefixed to it
+        # when it is flushed, so at most six headings are copied per chunk.
+        heading_stack = []
+        current_trail = ()
+        # Fence of the code block the scan is in, if any; "#" lines inside code
+        # blocks are comments, not headings
+        open_fence = None
+
         # Try to split by double newlines (paragraphs) first
-        paragraphs = re.split(r'\n\s*\n', content)
-        
+        paragraphs = PARAGRAPH_SPLIT_RE.split(content)
+
         for paragraph in paragraphs:
             paragraph = paragraph.strip()
             if not paragraph:
                 continue
-                
+
+            # A heading closes every open section at its level or deeper
+            if open_fence is None and paragraph.startswith("#"):
+                match = HEADING_RE.match(paragraph)
+                if match:
+                    level = len(match.group(1))
+                    while heading_stack and heading_stack[-1][0] >= level:
+                        heading_stack.pop()
+                    heading_stack.append((level, paragraph.split("\n", 1)[0]))
+
+            if "```" in paragraph or "~~~" in paragraph:
+                open_fence = _update_fence(paragraph, open_fence)
+
             # If adding this paragraph would exceed chunk size
-            if len(current_chunk + "\n\n" + paragraph) > chunk_size and current_chunk:
+            if current_parts and current_len + 2 + len(paragraph) > chunk_size:
                 # Save current chunk and start a new one
-                chunks.append(current_chunk.strip())
-                current_chunk = paragraph
+                chunks.append(
+                    _add_heading_context("\n\n".join(current_parts), current_trail)
+                )
+                current_parts = [paragraph]
+                current_len = len(paragraph)
+                current_trail = tuple(line for _, line in heading_stack)
             elif len(paragraph) > chunk_size:
                 # If current chunk has content, save it first
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
+                if current_parts:
+                    chunks.append(
+                        _add_heading_context("\n\n".join(current_parts), current_trail)
+                    )
+                    current_parts = []
+                    current_len = 0
+                current_trail = tuple(line for _, line in heading_stack)
+
                 # Split large paragraph by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-                temp_chunk = ""
-                
+                sentences = SENTENCE_SPLIT_RE.split(paragraph)
+                sentence_parts = []
+                sentence_len = 0
+
                 for sentence in sentences:
-                    if len(temp_chunk + " " + sentence) > chunk_size and temp_chunk:
-                        chunks.append(temp_chunk.strip())
-                        temp_chunk = sentence
-                    else:
-                        temp_chunk = (temp_chunk + " " + sentence).strip()
-                
+                    if sentence_parts and sentence_len + 1 + len(sentence) > chunk_size:
+                        chunks.append(
+                            _add_heading_context(" ".join(sentence_parts), current_trail)
+                        )
+                        sentence_parts = [sentence]
+                        sentence_len = len(sentence)
+                    elif sentence_parts:
+                        sentence_parts.append(sentence)
+                        sentence_len += 1 + len(sentence)
+                    elif sentence:
+                        sentence_parts = [sentence]
+                        sentence_len = len(sentence)
+
                 # Add remaining sentences as current chunk
-                if temp_chunk:
-                    current_chunk = temp_chunk
+                if sentence_parts:
+                    current_parts = [" ".join(sentence_parts)]
+                    current_len = sentence_len
             else:
                 # Add paragraph to current chunk
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
-                else:
-                    current_chunk = paragraph
-        
+                if not current_parts:
+                    current_trail = tuple(line for _, line in heading_stack)
+                current_len += (2 if current_parts else 0) + len(paragraph)
+                current_parts.append(paragraph)
+
         # Add the last chunk if it has content
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-        
+        if current_parts:
+            chunks.append(
+                _add_heading_context("\n\n".join(current_parts), current_trail)
+            )
+
         # Fallback: if no chunks were created, split by character count
         if not chunks:
             logger.warning("Fallback to character-based chunking")
@@ -142,12 +256,13 @@ async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
                 if chunk.strip():
                     chunks.append(chunk.strip())
 
-        logger.info(f"Successfully chunked content into {len(chunks)} chunks")
+        chunk_count = len(chunks)
+        logger.info("Successfully chunked content into %d chunks", chunk_count)
 
         return {
             "success": True,
             "chunks": chunks,
-            "message": f"Content chunked into {len(chunks)} parts",
+            "message": f"Content chunked into {chunk_count} parts",
         }
 
     except Exception as e:
@@ -157,3 +272,40 @@ async def chunk_markdown(content: str, chunk_size: int = 800) -> Dict[str, Any]:
             "chunks": [],
             "message": f"Error chunking markdown: {str(e)}",
         }
+
+
+def _get_chunk_pool() -> ProcessPoolExecutor:
+    """Returns the worker pool for large documents, creating it on first use."""
+    global _chunk_pool
+    if _chunk_pool is None:
+        # Workers come from a forkserver rather than a fork of the server, which
+        # already runs threads (database clients, memory writer) whose held locks
+        # a forked child would inherit
+        _chunk_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _chunk_pool
+
+
+def shutdown_chunk_pool() -> None:
+    """Stops the worker processes, if any were started."""
+    global _chunk_pool
+    if _chunk_pool is not None:
+        _chunk_pool.shutdown(wait=False, cancel_futures=True)
+        _chunk_pool = None
+
+
+@functools.wraps(chunk_markdown)
+async def chunk_markdown_async(
+    content: str, chunk_size: int = 800, token_limit: int = 0
+) -> Dict[str, Any]:
+    # Registered as the chunk_markdown tool: small documents are split inline, very
+    # large ones in a separate process so the GIL is not held by the event loop
+    if content and len(content) > PROCESS_POOL_THRESHOLD:
+        logger.info("Chunking %d characters in a worker process", len(content))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_chunk_pool(), chunk_markdown, content, chunk_size, token_limit
+        )
+    return chunk_markdown(content, chunk_size, token_limit)
@@ -1,14 +1,11 @@
 from typing import Dict, Any
 import logging
 import os
-import sys
 from dotenv import load_dotenv
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, OperationFailure
 
-# Add the parent directory to the path to import utils
-sys.path.append(os.path.dirname(__file__) + "/..")
-from utils import sanitize_content
+from tools.utils import sanitize_content
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -18,6 +15,38 @@ DB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("MONGODB_DB_NAME", "markdown_documents")
 COLLECTION_NAME = os.getenv("MONGODB_COLLECTION", "documents")
 
+# One client per process: MongoClient is thread-safe and keeps its own connection
+# pool, so reusing it avoids a new handshake and server selection on every fetch.
+# The constructor does not connect; the first query does.
+mongo_client = MongoClient(DB_URI, maxPoolSize=50, serverSelectionTimeoutMS=5000)
+documents_collection = mongo_client[DB_NAME][COLLECTION_NAME]
+
+# Only the fields the tool returns are read back from the database
+DOCUMENT_PROJECTION = {
+    "_id": 0,
+    "content": 1,
+    "title": 1,
+    "author": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "tags": 1,
+}
+
+_index_ensured = False
+
+
+def _ensure_document_index() -> None:
+    """Creates the google_document_id index once per process so lookups avoid a collection scan."""
+    global _index_ensured
+    if _index_ensured:
+        return
+    try:
+        documents_collection.create_index("google_document_id")
+    except OperationFailure as e:
+        # Missing privileges should not block reads, the lookup still works unindexed
+        logger.warning(f"Could not create google_document_id index: {str(e)}")
+    _index_ensured = True
+
 
 async def fetch_markdown_content(document_id: str) -> Dict[str, Any]:
     """
@@ -62,18 +91,12 @@ async def fetch_markdown_content(document_id: str) -> Dict[str, Any]:
     try:
         logger.info(f"Fetching document with Google Document ID: {document_id}")
 
-        # Connect to MongoDB
-        client = MongoClient(DB_URI, serverSelectionTimeoutMS=5000)
-
-        # Select database and collection
-        db = client[DB_NAME]
-        collection = db[COLLECTION_NAME]
+        _ensure_document_index()
 
         # Query for the document using google_document_id field
-        document = collection.find_one({"google_document_id": document_id})
-
-        # Close the connection
-        client.close()
+        document = documents_collection.find_one(
+            {"google_document_id": document_id}, DOCUMENT_PROJECTION
+        )
 
         if not document:
             logger.warning(
@@ -1,29 +1,72 @@
 from typing import List
 import logging
 import os
-import sys
 import traceback
-from openai import AsyncOpenAI
-from dotenv import load_dotenv
 
-# Add the parent directory to the path to import api_utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from api_utils import retry_api_call
+from api_utils import async_retry_api_call
 
-# Import utils for content sanitization
-sys.path.append(os.path.dirname(__file__) + "/..")
-from utils import sanitize_content, validate_json_serializable
+# Import the shared LLM client (which also loads .env) and utils for content sanitization
+from tools.llm_client import TRANSIENT_API_ERRORS, api_semaphore, client
+from tools.summary_cache import cache_summary, get_cached_summary, summary_cache_key
+from tools.utils import sanitize_content, validate_json_serializable
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Get API key from environment
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-OPENAI_BASE_URL = os.getenv(
-    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
-)
 MODEL = os.getenv("MODEL", "gemini-2.0-flash")
 
+# Style-specific formatting instructions
+STYLE_INSTRUCTIONS = {
+    "technical": "Format the summary in an academic style, preserving all technical terms, mathematical formulas (using LaTeX where appropriate), and maintaining precision. Structure with appropriate sections and subsections.",
+    "bullet-points": "Format the summary as a hierarchical bullet-point list, organizing information logically. Group related points together under clear headings. Use concise language for each point.",
+    "standard": "Format the summary as a cohesive narrative with clear paragraphs, transitions between topics, and a logical flow. Ensure it reads as a single, unified document rather than disconnected sections.",
+    "concise": "Format the summary to be extremely brief while capturing essential information. Use tight, economical language. Aim for a significantly reduced length while maintaining core meaning.",
+    "detailed": "Format the summary to include both main points and supporting details in a structured document. Include examples where relevant. Create a comprehensive overview that could substitute for the original content.",
+}
+
+# System message shared by every formatting request
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert editor specializing in combining and formatting summaries into cohesive documents.",
+}
+
+# Prompt template for combining chunk summaries
+FORMATTING_PROMPT_TEMPLATE = """
+        {title_context}I have multiple summaries of different sections of a document that need to be combined into a single cohesive summary:
+
+        {combined_text}
+
+        Please integrate these summaries into a single, well-organized summary that flows naturally.
+
+        {format_instruction}
+
+        Remove repetition, resolve contradictions, and ensure the final summary is coherent and unified.
+        """
+
+
+def _combine_without_llm(summaries: List[str], style: str) -> str:
+    """
+    Join summaries into a single sectioned document without calling the LLM.
+
+    Args:
+        summaries: Sanitized, non-empty summaries to combine
+        style: The desired style of the final summary
+
+    Returns:
+        str: The summaries laid out as numbered sections
+    """
+    if style == "bullet-points":
+        sections = [
+            f"## Section {i+1}\n{summary.strip()}"
+            for i, summary in enumerate(summaries)
+        ]
+    else:
+        sections = [
+            f"**Section {i+1}:** {summary.strip()}"
+            for i, summary in enumerate(summaries)
+        ]
+
+    return "# Combined Summary\n\n" + "\n\n".join(sections)
+
 
 async def format_summary(
     summaries: List[str], style: str = "standard", title: str = ""
@@ -90,142 +133,98 @@ async def format_summary(
 
         logger.info(f"Valid summaries after filtering: {len(valid_summaries)}")
 
-        # If there's only one summary and it's not too long, return it directly
-        if len(valid_summaries) == 1 and len(valid_summaries[0]) < 4000:
+        # A single summary has nothing to combine, so skip the LLM round-trip
+        if len(valid_summaries) == 1:
+            logger.info("Only one summary; skipping the combination LLM call")
             return valid_summaries[0]
 
-        # Initialize the OpenAI client with Gemini base URL and API key
-        client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=OPENAI_BASE_URL)
-
-        # Create style-specific formatting instructions
-        style_instructions = {
-            "technical": "Format the summary in an academic style, preserving all technical terms, mathematical formulas (using LaTeX where appropriate), and maintaining precision. Structure with appropriate sections and subsections.",
-            "bullet-points": "Format the summary as a hierarchical bullet-point list, organizing information logically. Group related points together under clear headings. Use concise language for each point.",
-            "standard": "Format the summary as a cohesive narrative with clear paragraphs, transitions between topics, and a logical flow. Ensure it reads as a single, unified document rather than disconnected sections.",
-            "concise": "Format the summary to be extremely brief while capturing essential information. Use tight, economical language. Aim for a significantly reduced length while maintaining core meaning.",
-            "detailed": "Format the summary to include both main points and supporting details in a structured document. Include examples where relevant. Create a comprehensive overview that could substitute for the original content.",
-        }
-
         # Get style instructions or default to standard
-        format_instruction = style_instructions.get(
-            style, style_instructions["standard"]
+        format_instruction = STYLE_INSTRUCTIONS.get(
+            style, STYLE_INSTRUCTIONS["standard"]
         )
 
         # Combine summaries into a single text for processing
         combined_text = "\n\n".join(
             [f"Summary Part {i+1}:\n{summary}" for i, summary in enumerate(valid_summaries)]
         )
-        
-        # Validate that the combined text is not too corrupted
-        combined_text = sanitize_content(combined_text)
-        if not combined_text or len(combined_text.strip()) < 20:
-            logger.error("Combined text is too short or corrupted after sanitization")
+
+        # The parts are already sanitized and stripped, so only the length needs checking
+        if len(combined_text) < 20:
+            logger.error("Combined text is too short to send for formatting")
             # Use direct fallback
-            if style == "bullet-points":
-                combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                    f"## Section {i+1}\n{summary.strip()}" 
-                    for i, summary in enumerate(valid_summaries)
-                ])
-            else:
-                combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                    f"**Section {i+1}:** {summary.strip()}" 
-                    for i, summary in enumerate(valid_summaries)
-                ])
-            
-            return combined_summary
+            return _combine_without_llm(valid_summaries, style)
 
         # Create the formatting prompt
         title_context = f"Title/Context: {title}\n\n" if title else ""
 
-        formatting_prompt = f"""
-        {title_context}I have multiple summaries of different sections of a document that need to be combined into a single cohesive summary:
-
-        {combined_text}
-
-        Please integrate these summaries into a single, well-organized summary that flows naturally.
-
-        {format_instruction}
+        formatting_prompt = FORMATTING_PROMPT_TEMPLATE.format(
+            title_context=title_context,
+            combined_text=combined_text,
+            format_instruction=format_instruction,
+        )
 
-        Remove repetition, resolve contradictions, and ensure the final summary is coherent and unified.
-        """
+        # The same summaries, title and style always produce the same prompt, so a
+        # repeated request is answered from the cache without calling the LLM
+        cache_key = summary_cache_key(formatting_prompt, style, MODEL)
+        cached_summary = get_cached_summary(cache_key)
+        if cached_summary is not None:
+            logger.info("Using cached %s combined summary", style)
+            return {
+                "success": True,
+                "message": "Exam structure generated successfully",
+                "combined_summary": cached_summary,
+            }
 
-        # Call the LLM to generate the formatted summary
+        # Call the LLM to generate the formatted summary. The completion is streamed,
+        # so a long combined summary arrives while it is generated and the read
+        # timeout applies between chunks rather than to the whole answer
         async def make_api_call():
-            return await client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert editor specializing in combining and formatting summaries into cohesive documents.",
-                    },
-                    {"role": "user", "content": formatting_prompt},
-                ],
-                temperature=0.3,  # Lower temperature for consistent formatting
-            )
+            async with api_semaphore:
+                stream = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        SYSTEM_MESSAGE,
+                        {"role": "user", "content": formatting_prompt},
+                    ],
+                    temperature=0.3,  # Lower temperature for consistent formatting
+                    stream=True,
+                    timeout=60,
+                )
+                parts = []
+                async for event in stream:
+                    if event.choices and event.choices[0].delta.content:
+                        parts.append(event.choices[0].delta.content)
+                return "".join(parts) if parts else None
 
         try:
-            # Use retry_api_call to handle transient API errors
-            response = await retry_api_call(
-                make_api_call, max_retries=3, initial_delay=1.0, backoff_factor=2.0
+            # Use async_retry_api_call to handle transient API errors
+            combined_summary = await async_retry_api_call(
+                make_api_call,
+                max_retries=3,
+                initial_delay=1.0,
+                backoff_factor=2.0,
+                retry_on=TRANSIENT_API_ERRORS,
             )
-
-            if not response or not response.choices or not response.choices[0].message:
-                logger.error("API returned empty or invalid response")
-                return "Error: API returned an invalid response. Please try again."
-
-            combined_summary = response.choices[0].message.content
             
-            # Check if the content is None or empty
+            # Fall back to a simple combination if the API returned nothing usable.
+            # The fallback is built from sanitized, non-empty summaries, so it never
+            # needs sanitizing or validating again.
             if combined_summary is None:
-                logger.error("API returned None content, falling back to simple combination")
-                # Improved fallback: create a properly formatted combined summary
-                if style == "bullet-points":
-                    combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                        f"## Section {i+1}\n{summary.strip()}" 
-                        for i, summary in enumerate(valid_summaries)
-                    ])
-                else:
-                    combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                        f"**Section {i+1}:** {summary.strip()}" 
-                        for i, summary in enumerate(valid_summaries)
-                    ])
-                
-                # Sanitize the fallback content
-                combined_summary = sanitize_content(combined_summary)
-                
-                if not combined_summary or len(combined_summary.strip()) < 10:
-                    return "Error: API returned None content and fallback failed. Please try again."
-            
-            # Sanitize the content to remove any invalid control characters
-            combined_summary = sanitize_content(combined_summary)
-            
-            if not combined_summary or not combined_summary.strip():
-                logger.error("API returned content that became empty after sanitization")
-                # Try the improved fallback approach
-                if style == "bullet-points":
-                    combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                        f"## Section {i+1}\n{summary.strip()}" 
-                        for i, summary in enumerate(valid_summaries)
-                    ])
-                else:
-                    combined_summary = "# Combined Summary\n\n" + "\n\n".join([
-                        f"**Section {i+1}:** {summary.strip()}" 
-                        for i, summary in enumerate(valid_summaries)
-                    ])
-                
-                # Sanitize the fallback content
+                logger.error("API returned no content, falling back to simple combination")
+                combined_summary = _combine_without_llm(valid_summaries, style)
+            else:
+                # Sanitize the content to remove any invalid control characters
                 combined_summary = sanitize_content(combined_summary)
-                
-                if not combined_summary or not combined_summary.strip():
-                    return "Error: Content became empty after sanitization and fallback failed. Please try again."
-            
-            # Validate that the content is JSON serializable
-            if not validate_json_serializable(combined_summary):
-                logger.error("API returned content that is not JSON serializable")
-                combined_summary = sanitize_content(combined_summary)  # Try to fix it again
-                if not validate_json_serializable(combined_summary):
+
+                if not combined_summary:
+                    logger.error("API returned content that became empty after sanitization")
+                    combined_summary = _combine_without_llm(valid_summaries, style)
+                elif not validate_json_serializable(combined_summary):
+                    logger.error("API returned content that is not JSON serializable")
                     return "Error: API returned content with invalid characters that cannot be serialized."
-            
+                else:
+                    cache_summary(cache_key, combined_summary)
+
             logger.info(f"Successfully combined and formatted summaries. Length: {len(combined_summary)}")
 
             # Return just the summary content as a string when used as final tool
@@ -239,7 +238,7 @@ async def format_summary(
 
         except Exception as e:
             logger.error(f"Error in API call after retries: {str(e)}")
-            traceback.print_exc()
+            logger.debug(traceback.format_exc())
             return f"Error formatting and combining summaries: {str(e)}"
 
     except Exception as e:
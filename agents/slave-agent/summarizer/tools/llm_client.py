@@ -0,0 +1,51 @@
+"""
+Shared LLM client for the summarizer tools
+"""
+import os
+import asyncio
+import httpx
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+)
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Get API key from environment
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+OPENAI_BASE_URL = os.getenv(
+    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
+)
+
+# A single HTTP/2 connection pool shared by every tool, so concurrent calls are
+# multiplexed over open connections instead of paying a new TLS handshake each
+http_client = DefaultAsyncHttpxClient(
+    http2=True,
+    timeout=httpx.Timeout(60.0, connect=5.0),
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
+
+# SDK retries are disabled: async_retry_api_call is the only retry layer, and its
+# backoff sleeps run outside api_semaphore
+client = AsyncOpenAI(
+    api_key=GEMINI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    http_client=http_client,
+    max_retries=0,
+)
+
+# Caps in-flight Gemini requests across all tools to stay under the provider quota
+api_semaphore = asyncio.Semaphore(int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx responses
+TRANSIENT_API_ERRORS = (
+    RateLimitError,
+    APITimeoutError,
+    APIConnectionError,
+    InternalServerError,
+)
@@ -1,29 +1,45 @@
 from typing import Dict, Any
 import logging
 import os
-import sys
 import traceback
-from openai import AsyncOpenAI
-from dotenv import load_dotenv
 
-# Add the parent directory to the path to import api_utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from api_utils import retry_api_call
+from api_utils import async_retry_api_call
 
-# Import utils for content sanitization
-sys.path.append(os.path.dirname(__file__) + "/..")
-from utils import sanitize_content
+# Import the shared LLM client (which also loads .env) and utils for content sanitization
+from tools.llm_client import TRANSIENT_API_ERRORS, api_semaphore, client
+from tools.summary_cache import cache_summary, get_cached_summary, summary_cache_key
+from tools.utils import sanitize_content
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Get API key from environment
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-OPENAI_BASE_URL = os.getenv(
-    "BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
-)
 MODEL = os.getenv("MODEL", "gemini-2.0-flash")
 
+# Style-specific summarization instructions
+STYLE_INSTRUCTIONS = {
+    "technical": "Create a technical summary that preserves mathematical formulas, technical terms, and maintains academic precision. Use LaTeX formatting for equations where appropriate.",
+    "bullet-points": "Create a bullet-point summary highlighting the key points and important information. Use clear, concise language and organize points hierarchically.",
+    "standard": "Create a comprehensive summary in paragraph form that captures the main ideas and important details in a well-structured, flowing narrative.",
+    "concise": "Create an extremely concise summary focusing only on the most essential information. Aim for brevity while maintaining clarity.",
+    "detailed": "Create a detailed summary that captures main points as well as supporting details, examples, and nuances from the original text.",
+}
+
+# System message shared by every summarization request
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert summarizer that creates high-quality summaries of markdown text.",
+}
+
+# Prompt template for summarization, filled in per chunk
+SUMMARIZATION_PROMPT_TEMPLATE = """
+        Summarize the following markdown content:
+
+        {content}
+
+        {style_instruction}
+
+        Maintain the markdown formatting where appropriate. Ensure the summary remains faithful to the original content.
+        """
+
 
 async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, Any]:
     """
@@ -66,7 +82,7 @@ async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, An
                     description: Status message or error information
     """
     try:
-        logger.info(f"Summarizing content chunk in {style} style")
+        logger.info("Summarizing content chunk in %s style", style)
 
         # Validate input content
         if not content or not content.strip():
@@ -88,53 +104,49 @@ async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, An
                 "message": "Content is empty after removing invalid characters",
             }
 
-        # Initialize the OpenAI client with Gemini base URL and API key
-        client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=OPENAI_BASE_URL)
-
-        # Create a style-specific prompt
-        style_instructions = {
-            "technical": "Create a technical summary that preserves mathematical formulas, technical terms, and maintains academic precision. Use LaTeX formatting for equations where appropriate.",
-            "bullet-points": "Create a bullet-point summary highlighting the key points and important information. Use clear, concise language and organize points hierarchically.",
-            "standard": "Create a comprehensive summary in paragraph form that captures the main ideas and important details in a well-structured, flowing narrative.",
-            "concise": "Create an extremely concise summary focusing only on the most essential information. Aim for brevity while maintaining clarity.",
-            "detailed": "Create a detailed summary that captures main points as well as supporting details, examples, and nuances from the original text.",
-        }
+        # Identical chunks summarized before in the same style are served from the cache
+        cache_key = summary_cache_key(content, style, MODEL)
+        cached_summary = get_cached_summary(cache_key)
+        if cached_summary is not None:
+            logger.info("Using cached %s summary", style)
+            return {
+                "success": True,
+                "summary": cached_summary,
+                "message": f"Successfully generated {style} summary",
+            }
 
         # Get the style-specific instructions or default to standard if style is not recognized
-        style_instruction = style_instructions.get(
-            style, style_instructions["standard"]
+        style_instruction = STYLE_INSTRUCTIONS.get(
+            style, STYLE_INSTRUCTIONS["standard"]
         )
 
         # Create prompt for summarization
-        summarization_prompt = f"""
-        Summarize the following markdown content:
-
-        {content}
-
-        {style_instruction}
-
-        Maintain the markdown formatting where appropriate. Ensure the summary remains faithful to the original content.
-        """
+        summarization_prompt = SUMMARIZATION_PROMPT_TEMPLATE.format(
+            content=content, style_instruction=style_instruction
+        )
 
         # Call the LLM to generate the summary
         async def make_api_call():
-            return await client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert summarizer that creates high-quality summaries of markdown text.",
-                    },
-                    {"role": "user", "content": summarization_prompt},
-                ],
-                temperature=0.3,  # Lower temperature for more focused summaries
-                max_tokens=300,   # Moderate length for individual chunk summaries
-            )
+            async with api_semaphore:
+                return await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        SYSTEM_MESSAGE,
+                        {"role": "user", "content": summarization_prompt},
+                    ],
+                    temperature=0.3,  # Lower temperature for more focused summaries
+                    max_tokens=300,   # Moderate length for individual chunk summaries
+                    timeout=60,
+                )
 
         try:
-            # Use retry_api_call to handle transient API errors with longer delays for rate limiting
-            response = await retry_api_call(
-                make_api_call, max_retries=5, initial_delay=2.0, backoff_factor=2.0
+            # Use async_retry_api_call to handle transient API errors with longer delays for rate limiting
+            response = await async_retry_api_call(
+                make_api_call,
+                max_retries=5,
+                initial_delay=2.0,
+                backoff_factor=2.0,
+                retry_on=TRANSIENT_API_ERRORS,
             )
 
             if not response or not response.choices or not response.choices[0].message:
@@ -167,7 +179,8 @@ async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, An
                     "message": "Summary is empty after sanitization. Please try again.",
                 }
             
-            logger.info(f"Successfully generated {style} summary")
+            cache_summary(cache_key, summary)
+            logger.info("Successfully generated %s summary", style)
 
             return {
                 "success": True,
@@ -176,8 +189,8 @@ async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, An
             }
 
         except Exception as e:
-            logger.error(f"Error in API call after retries: {str(e)}")
-            traceback.print_exc()
+            logger.error("Error in API call after retries: %s", e)
+            logger.debug(traceback.format_exc())
             return {
                 "success": False,
                 "summary": "",
@@ -185,7 +198,7 @@ async def summarize_chunk(content: str, style: str = "standard") -> Dict[str, An
             }
 
     except Exception as e:
-        logger.error(f"Error summarizing content: {str(e)}")
+        logger.error("Error summarizing content: %s", e)
         return {
             "success": False,
             "summary": "",
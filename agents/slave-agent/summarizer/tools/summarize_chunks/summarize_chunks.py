@@ -0,0 +1,339 @@
+from typing import Dict, Any, List, Union
+import asyncio
+import logging
+import os
+import orjson
+
+from api_utils import async_retry_api_call
+from tools.summarize_chunk.summarize_chunk import (
+    MODEL,
+    STYLE_INSTRUCTIONS,
+    SYSTEM_MESSAGE,
+    summarize_chunk,
+)
+
+# Import the shared LLM client and utils for content sanitization
+from tools.llm_client import TRANSIENT_API_ERRORS, api_semaphore, client
+from tools.summary_cache import cache_summary, get_cached_summary, summary_cache_key
+from tools.utils import CHARS_PER_TOKEN, sanitize_content
+
+logger = logging.getLogger(__name__)
+
+# Input tokens packed into a single batched request
+BATCH_TOKEN_BUDGET = int(os.getenv("SUMMARY_BATCH_TOKENS", "8000"))
+
+# Output tokens allowed per chunk summary, the same budget summarize_chunk uses
+SUMMARY_TOKENS_PER_CHUNK = 300
+
+# Output tokens one batched reply may use; gemini-2.0-flash caps output at 8192
+BATCH_OUTPUT_TOKEN_LIMIT = int(os.getenv("SUMMARY_BATCH_OUTPUT_TOKENS", "8000"))
+
+# Chunks per batch, so every summary in the reply fits the output limit
+MAX_BATCH_CHUNKS = max(1, BATCH_OUTPUT_TOKEN_LIMIT // SUMMARY_TOKENS_PER_CHUNK)
+
+# Prompt template for summarizing several chunks in one request
+BATCH_SUMMARIZATION_PROMPT_TEMPLATE = """
+        Summarize each of the following markdown chunks independently.
+
+        {style_instruction}
+
+        Maintain the markdown formatting where appropriate. Ensure each summary remains faithful to its own chunk.
+
+        Return a JSON object of the form {{"summaries": [{{"id": <chunk id>, "summary": "<summary>"}}]}} with exactly one entry per input chunk.
+
+        Chunks:
+        {chunks_json}
+        """
+
+
+def _pack_batches(chunks: List[str]) -> List[List[int]]:
+    """
+    Groups chunk indices into batches that fit the input token budget and hold at
+    most MAX_BATCH_CHUNKS chunks, keeping the given order.
+    Blank chunks get a batch of their own so summarize_chunk reports them.
+    """
+    budget = BATCH_TOKEN_BUDGET * CHARS_PER_TOKEN
+    batches = []
+    current = []
+    current_size = 0
+    for i, chunk in enumerate(chunks):
+        if not chunk or not chunk.strip():
+            batches.append([i])
+            continue
+        if current and (
+            current_size + len(chunk) > budget or len(current) >= MAX_BATCH_CHUNKS
+        ):
+            batches.append(current)
+            current = []
+            current_size = 0
+        current.append(i)
+        current_size += len(chunk)
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _summarize_batch(chunks: List[str], style: str) -> Dict[int, str]:
+    """
+    Summarizes several chunks with a single LLM call.
+
+    Returns the summaries keyed by the chunk position within the batch; chunks the
+    model skipped or answered with an invalid entry are left out.
+    """
+    style_instruction = STYLE_INSTRUCTIONS.get(style, STYLE_INSTRUCTIONS["standard"])
+    chunks_json = orjson.dumps(
+        [{"id": i, "text": sanitize_content(chunk)} for i, chunk in enumerate(chunks)]
+    ).decode()
+    batch_prompt = BATCH_SUMMARIZATION_PROMPT_TEMPLATE.format(
+        style_instruction=style_instruction, chunks_json=chunks_json
+    )
+
+    async def make_api_call():
+        async with api_semaphore:
+            return await client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    SYSTEM_MESSAGE,
+                    {"role": "user", "content": batch_prompt},
+                ],
+                temperature=0.3,
+                max_tokens=min(
+                    SUMMARY_TOKENS_PER_CHUNK * len(chunks), BATCH_OUTPUT_TOKEN_LIMIT
+                ),
+                response_format={"type": "json_object"},
+                timeout=60,
+            )
+
+    # Two attempts in total (the client itself does not retry): whatever the batch does not return is summarized per chunk,
+    # so waiting through more retries would only delay that fallback
+    response = await async_retry_api_call(
+        make_api_call,
+        max_retries=2,
+        initial_delay=2.0,
+        backoff_factor=2.0,
+        retry_on=TRANSIENT_API_ERRORS,
+    )
+
+    if not response or not response.choices or not response.choices[0].message.content:
+        logger.warning("Empty response for a batch of %d chunks", len(chunks))
+        return {}
+
+    try:
+        entries = orjson.loads(response.choices[0].message.content).get(
+            "summaries", []
+        )
+    except (orjson.JSONDecodeError, AttributeError) as e:
+        logger.warning("Invalid JSON for a batch of %d chunks: %s", len(chunks), e)
+        return {}
+
+    summaries = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        chunk_id = entry.get("id")
+        summary = entry.get("summary")
+        if (
+            isinstance(chunk_id, int)
+            and 0 <= chunk_id < len(chunks)
+            and isinstance(summary, str)
+        ):
+            summary = sanitize_content(summary)
+            if summary:
+                summaries[chunk_id] = summary
+    return summaries
+
+
+async def _summarize_group(chunks: List[str], style: str) -> List[Dict[str, Any]]:
+    """
+    Summarizes a packed group of chunks, falling back to one call per chunk for
+    anything the batched call did not return.
+    """
+    if len(chunks) == 1:
+        return [await summarize_chunk(chunks[0], style)]
+
+    try:
+        batch_summaries = await _summarize_batch(chunks, style)
+    except Exception as e:
+        logger.warning("Batched summarization failed, falling back per chunk: %s", e)
+        batch_summaries = {}
+
+    for i, summary in batch_summaries.items():
+        cache_summary(
+            summary_cache_key(sanitize_content(chunks[i]), style, MODEL), summary
+        )
+
+    missing = [i for i in range(len(chunks)) if i not in batch_summaries]
+    if missing:
+        logger.info("Summarizing %d chunks individually after batch call", len(missing))
+    fallback = await asyncio.gather(
+        *(summarize_chunk(chunks[i], style) for i in missing),
+        return_exceptions=True,
+    )
+    fallback_results = dict(zip(missing, fallback))
+
+    return [
+        fallback_results[i]
+        if i in fallback_results
+        else {"success": True, "summary": batch_summaries[i]}
+        for i in range(len(chunks))
+    ]
+
+
+def _coerce_chunks(chunks: Union[List[str], str]) -> List[str]:
+    """
+    Returns the chunks as a list. A model calling the tool may send them as a
+    JSON-encoded array or as one plain string; iterating that string would turn
+    every character into its own chunk.
+    """
+    if not isinstance(chunks, str):
+        return chunks
+    if chunks.lstrip().startswith("["):
+        try:
+            parsed = orjson.loads(chunks)
+        except orjson.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, list):
+            return [item if isinstance(item, str) else str(item) for item in parsed]
+    return [chunks] if chunks else []
+
+
+async def summarize_chunks(chunks: List[str], style: str = "standard") -> Dict[str, Any]:
+    """
+    Summarizes several chunks of markdown content concurrently in the specified style.
+
+    Chunks are packed into batches of roughly SUMMARY_BATCH_TOKENS input tokens and
+    each batch is summarized with a single LLM call, so N chunks cost far fewer than
+    N requests. Batches run concurrently, and a chunk missing from a batched answer
+    is retried on its own. Chunks already summarized in the same style are served
+    from an in-process cache. A failing chunk does not abort the others.
+
+    Args:
+        chunks: The markdown chunks to be summarized, in document order
+        style: The style of the summaries (technical, bullet-pointed, standard, concise, detailed)
+
+    Returns:
+        Dict containing the summaries in the same order as the chunks
+
+    Tool:
+        name: summarize_chunks
+        description: Summarizes several chunks of markdown content concurrently in the specified style
+        input_schema:
+            type: object
+            properties:
+                chunks:
+                    type: array
+                    description: The markdown chunks to be summarized, in document order
+                    items:
+                        type: string
+                style:
+                    type: string
+                    description: The style of the summaries (technical, bullet-points, standard, concise, detailed)
+                    enum: [technical, bullet-points, standard, concise, detailed]
+                    default: standard
+            required:
+                - chunks
+        output_schema:
+            type: object
+            properties:
+                summaries:
+                    type: array
+                    description: The summaries of the chunks that succeeded, in document order
+                    items:
+                        type: string
+                errors:
+                    type: array
+                    description: One error message per chunk that could not be summarized
+                    items:
+                        type: string
+                success:
+                    type: boolean
+                    description: Whether at least one chunk was summarized
+                message:
+                    type: string
+                    description: Status message or error information
+    """
+    try:
+        chunks = _coerce_chunks(chunks)
+        logger.info(
+            "Summarizing %d chunks concurrently in %s style", len(chunks), style
+        )
+
+        if not chunks:
+            logger.warning("No chunks provided to summarize_chunks")
+            return {
+                "success": False,
+                "summaries": [],
+                "errors": [],
+                "message": "No chunks provided to summarize",
+            }
+
+        # Serve chunks summarized before from the cache and only send the rest
+        results = [None] * len(chunks)
+        pending = []
+        for i, chunk in enumerate(chunks):
+            cached_summary = get_cached_summary(
+                summary_cache_key(sanitize_content(chunk), style, MODEL)
+            )
+            if cached_summary is not None:
+                results[i] = {"success": True, "summary": cached_summary}
+            else:
+                pending.append(i)
+
+        # Longest chunks first (LPT), so batches hold chunks of similar size and
+        # the slowest requests start earliest instead of setting the tail latency
+        pending.sort(key=lambda i: len(chunks[i] or ""), reverse=True)
+        batches = [
+            [pending[j] for j in batch]
+            for batch in _pack_batches([chunks[i] for i in pending])
+        ]
+        batches.sort(
+            key=lambda batch: sum(len(chunks[i] or "") for i in batch), reverse=True
+        )
+        logger.info(
+            "Packed %d uncached chunks into %d requests", len(pending), len(batches)
+        )
+
+        batch_results = await asyncio.gather(
+            *(_summarize_group([chunks[i] for i in batch], style) for batch in batches),
+            return_exceptions=True,
+        )
+
+        # Re-assemble the per-chunk results in document order
+        for batch, batch_result in zip(batches, batch_results):
+            for position, i in enumerate(batch):
+                results[i] = (
+                    batch_result
+                    if isinstance(batch_result, Exception)
+                    else batch_result[position]
+                )
+
+        summaries = []
+        errors = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error("Error summarizing chunk %d: %s", i + 1, result)
+                errors.append(f"Chunk {i+1}: {str(result)}")
+            elif not result.get("success"):
+                errors.append(f"Chunk {i+1}: {result.get('message', 'Unknown error')}")
+            else:
+                summaries.append(result["summary"])
+
+        logger.info(
+            "Summarized %d of %d chunks in %s style", len(summaries), len(chunks), style
+        )
+
+        return {
+            "success": bool(summaries),
+            "summaries": summaries,
+            "errors": errors,
+            "message": f"Summarized {len(summaries)} of {len(chunks)} chunks",
+        }
+
+    except Exception as e:
+        logger.error("Error summarizing chunks: %s", e)
+        return {
+            "success": False,
+            "summaries": [],
+            "errors": [],
+            "message": f"Error summarizing chunks: {str(e)}",
+        }
@@ -0,0 +1,36 @@
+"""
+In-process cache of LLM summaries shared by the summarization tools
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+# Maximum number of summaries kept before the least recently used one is evicted
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def summary_cache_key(content: str, style: str, model: str) -> str:
+    """Returns the cache key for content summarized in a style by a model."""
+    # blake2b is faster than sha256 and collisions are not a concern for a local cache
+    return hashlib.blake2b(
+        f"{style}|{model}|{content}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def get_cached_summary(key: str) -> Optional[str]:
+    """Returns the cached summary for a key, or None on a miss."""
+    summary = _cache.get(key)
+    if summary is not None:
+        _cache.move_to_end(key)
+    return summary
+
+
+def cache_summary(key: str, summary: str) -> None:
+    """Stores a summary, evicting the least recently used entry when full."""
+    _cache[key] = summary
+    _cache.move_to_end(key)
+    while len(_cache) > SUMMARY_CACHE_SIZE:
+        _cache.popitem(last=False)
@@ -6,6 +6,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Rough characters-per-token ratio, good enough to size text without a tokenizer
+CHARS_PER_TOKEN = 4
+
 
 def sanitize_content(content: str) -> str:
     """
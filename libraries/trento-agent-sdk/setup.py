@@ -32,4 +32,7 @@ setup(
         "websockets",
         "google-genai",
     ],
+    extras_require={
+        "fast-json": ["orjson"],
+    },
 )
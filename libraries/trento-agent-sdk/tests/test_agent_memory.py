@@ -0,0 +1,24 @@
+import queue
+
+from trento_agent_sdk.agent import agent as agent_module
+from trento_agent_sdk.agent.agent import Agent
+
+
+class _RecordingMemory:
+    def __init__(self):
+        self.payloads = []
+
+    def insert_into_long_memory_with_update(self, payload):
+        self.payloads.append(payload)
+
+
+def test_full_memory_queue_reports_dropped_update(monkeypatch):
+    # A one-slot queue and no writer thread, so the second update cannot fit
+    monkeypatch.setattr(agent_module, "_memory_queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(agent_module, "_memory_writer", object())
+    agent = Agent.model_construct(long_memory=_RecordingMemory())
+
+    assert agent._save_to_long_memory("first") is True
+    assert agent._save_to_long_memory("second") is False
+    assert agent.dropped_memory_updates == 1
+    assert agent_module._memory_queue.qsize() == 1
@@ -0,0 +1,16 @@
+from typing import List
+
+from trento_agent_sdk.tool.tool import Tool
+
+
+def test_list_parameter_is_an_array_of_items():
+    def summarize(chunks: List[str], style: str = "standard"):
+        return chunks
+
+    properties = Tool.from_function(summarize).parameters["function"]["parameters"][
+        "properties"
+    ]
+
+    assert properties["chunks"]["type"] == "array"
+    assert properties["chunks"]["items"] == {"type": "string"}
+    assert properties["style"] == {"type": "string", "description": ""}
@@ -249,16 +249,24 @@ class A2AClient:
     async def wait_for_task_completion(
         self,
         task_id: str,
-        polling_interval: float = 1.0,
+        polling_interval: float = 0.1,
         timeout: Optional[float] = None,
+        max_polling_interval: float = 2.0,
+        backoff_factor: float = 2.0,
     ) -> GetTaskResponse:
         """
-        Wait for a task to complete, polling at the specified interval.
+        Wait for a task to complete, polling with exponential backoff.
+
+        Short tasks are noticed quickly, while long ones are polled at most every
+        max_polling_interval seconds instead of flooding the server with requests.
 
         Args:
             task_id: The ID of the task to wait for.
-            polling_interval: Time in seconds between polling attempts.
+            polling_interval: Time in seconds before the second polling attempt.
             timeout: Maximum time in seconds to wait for completion. None means wait indefinitely.
+            max_polling_interval: Upper bound in seconds for the time between attempts.
+            backoff_factor: Factor the interval is multiplied by after each attempt;
+                1.0 polls at a fixed interval.
 
         Returns:
             GetTaskResponse: The final task response when complete.
@@ -268,6 +276,8 @@ class A2AClient:
             Exception: If there's an error retrieving the task status.
         """
         start_time = asyncio.get_event_loop().time()
+        # A polling_interval above the cap is honoured as a fixed interval
+        max_polling_interval = max(max_polling_interval, polling_interval)
 
         while True:
             response = await self.get_task(task_id)
@@ -296,5 +306,6 @@ class A2AClient:
                         f"Task {task_id} did not complete within {timeout} seconds"
                     )
 
-            # Wait before polling again
+            # Wait before polling again, backing off up to the cap
             await asyncio.sleep(polling_interval)
+            polling_interval = min(polling_interval * backoff_factor, max_polling_interval)
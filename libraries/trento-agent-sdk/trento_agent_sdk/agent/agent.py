@@ -1,6 +1,9 @@
+import copy
 import json
 import logging
-from typing import List, Dict, Optional, Any, Literal, Annotated
+import queue
+import threading
+from typing import List, Dict, Optional, Any, Literal, Annotated, Callable, Tuple
 from ..memory.memory import LongMemory
 import openai
 from pydantic import BaseModel, ConfigDict, Field
@@ -8,8 +11,78 @@ from pydantic import BaseModel, ConfigDict, Field
 from ..tool.tool_manager import ToolManager
 from .agent_manager import AgentManager
 
+try:
+    import orjson
+except ImportError:  # optional speed-up, the stdlib encoder is used without it
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Long-term memory updates (LLM extraction, embeddings, Qdrant upsert) run in the
+# background so a turn never waits on them; a single daemon thread keeps them in
+# order. The queue is bounded, so under load updates are dropped (and counted in
+# Agent.dropped_memory_updates) rather than piling up, and pending ones never hold
+# up interpreter exit.
+MEMORY_QUEUE_SIZE = 100
+_memory_queue: "queue.Queue[Tuple[Callable[[Any], Any], Any]]" = queue.Queue(
+    maxsize=MEMORY_QUEUE_SIZE
+)
+_memory_writer: Optional[threading.Thread] = None
+_memory_writer_lock = threading.Lock()
+
+
+def _run_memory_writer() -> None:
+    while True:
+        write, payload = _memory_queue.get()
+        try:
+            write(payload)
+        except Exception as e:
+            logger.error(f"Error saving to long-term memory: {e}")
+        finally:
+            _memory_queue.task_done()
+
+
+def _queue_memory_write(write: Callable[[Any], Any], payload: Any) -> bool:
+    """
+    Queue a memory update for the writer thread, starting it on first use.
+
+    Returns False when the queue is full and the update was dropped.
+    """
+    global _memory_writer
+    with _memory_writer_lock:
+        if _memory_writer is None:
+            _memory_writer = threading.Thread(
+                target=_run_memory_writer, name="long-memory", daemon=True
+            )
+            _memory_writer.start()
+    try:
+        _memory_queue.put_nowait((write, payload))
+    except queue.Full:
+        logger.warning("Long-term memory queue is full, dropping an update")
+        return False
+    return True
+
+
+def _dumps_tool_result(result: Any) -> str:
+    """
+    Serialize a tool result to JSON.
+
+    A strict dump is attempted first; only if it fails are unknown values
+    stringified, so the common case costs a single serialization pass.
+    orjson is used when installed, since tool results such as chunk lists can
+    be several megabytes of text.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(result).decode()
+        except TypeError:
+            # e.g. non-string dict keys, which the stdlib encoder coerces
+            pass
+    try:
+        return json.dumps(result)
+    except (TypeError, ValueError):
+        return json.dumps(result, default=str)
+
 
 class Agent(BaseModel):
     """
@@ -38,6 +111,7 @@ class Agent(BaseModel):
     tool_required: Literal["required", "auto"] = "required"
     validation: bool = False
     validation_tool_name: str = None
+    dropped_memory_updates: int = 0  # long-term memory updates lost to a full queue
     system_prompt: str = (
         "You are a highly capable orchestrator assistant. Your primary role is to understand user requests "
         "and decide the best course of action. This might involve using your own tools or delegating tasks "
@@ -160,6 +234,23 @@ class Agent(BaseModel):
 
         return tool_list
 
+    def _save_to_long_memory(self, payload) -> bool:
+        """
+        Queue a long-term memory update without blocking the current turn.
+
+        Args:
+            payload: Tool result string or chat history to extract memories from
+
+        Returns:
+            False if the update was dropped; dropped_memory_updates counts these
+        """
+        queued = _queue_memory_write(
+            self.long_memory.insert_into_long_memory_with_update, payload
+        )
+        if not queued:
+            self.dropped_memory_updates += 1
+        return queued
+
     async def validate_result(self, tool_name, args):
         """
         Validate the result of a tool call and insert it into long-term memory.
@@ -179,7 +270,7 @@ class Agent(BaseModel):
             if isinstance(result, str):
                 serialized_result = result
             elif isinstance(result, (list, dict, int, float, bool)):
-                serialized_result = json.dumps(result)
+                serialized_result = _dumps_tool_result(result)
             elif hasattr(result, "__dict__"):
                 serialized_result = json.dumps(result.__dict__)
             else:
@@ -188,7 +279,7 @@ class Agent(BaseModel):
             logger.info(
                 f"Tool {tool_name} returned result: {serialized_result[:100]}..."
             )
-            self.long_memory.insert_into_long_memory_with_update(serialized_result)
+            self._save_to_long_memory(serialized_result)
 
         except Exception as e:
             logger.error(f"Error serializing tool result: {e}")
@@ -271,7 +362,6 @@ class Agent(BaseModel):
                 message_to_add = response.choices[0].message
                 if hasattr(message_to_add, 'content') and message_to_add.content and len(message_to_add.content) > 5000:
                     # Create a copy with truncated content
-                    import copy
                     message_copy = copy.deepcopy(message_to_add)
                     message_copy.content = message_to_add.content[:2000] + "... [Response truncated for memory management]"
                     self.short_memory.append(message_copy)
@@ -322,7 +412,7 @@ class Agent(BaseModel):
                                     elif isinstance(
                                         result, (list, dict, int, float, bool)
                                     ):
-                                        serialized_result = json.dumps(result)
+                                        serialized_result = _dumps_tool_result(result)
                                     elif hasattr(result, "_dict_"):
                                         serialized_result = json.dumps(result._dict_)
                                     else:
@@ -331,7 +421,7 @@ class Agent(BaseModel):
                                     logger.info(
                                         f"Tool {tool_name} returned result: {serialized_result[:100]}..."
                                     )
-                                    self.long_memory.insert_into_long_memory_with_update(
+                                    self._save_to_long_memory(
                                         serialized_result
                                     )
 
@@ -361,7 +451,7 @@ class Agent(BaseModel):
                                 return (
                                     result
                                     if isinstance(result, str)
-                                    else json.dumps(result)
+                                    else _dumps_tool_result(result)
                                 )
 
                             except Exception as e:
@@ -387,7 +477,7 @@ class Agent(BaseModel):
                                 if isinstance(result, str):
                                     serialized_result = result
                                 elif isinstance(result, (list, dict, int, float, bool)):
-                                    serialized_result = json.dumps(result)
+                                    serialized_result = _dumps_tool_result(result)
                                 elif hasattr(result, "_dict_"):
                                     serialized_result = json.dumps(result._dict_)
                                 else:
@@ -396,7 +486,7 @@ class Agent(BaseModel):
                                 logger.info(
                                     f"Tool {tool_name} returned result: {serialized_result[:100]}..."
                                 )
-                                self.long_memory.insert_into_long_memory_with_update(
+                                self._save_to_long_memory(
                                     serialized_result
                                 )
 
@@ -466,7 +556,7 @@ class Agent(BaseModel):
             self._ensure_all_tool_calls_have_responses(tool_call_ids, responded_tool_calls)
             
             # Save chat history to long memory
-            self.long_memory.insert_into_long_memory_with_update(self.chat_history)
+            self._save_to_long_memory(list(self.chat_history))
 
             # If we already have a final response (model didn't use tools), return it
             if final_response_content is not None:
@@ -2,6 +2,9 @@ import os
 import time
 import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 import requests
 from google import genai
@@ -15,6 +18,14 @@ logger.setLevel(logging.INFO)
 
 load_dotenv()
 
+# Shared pool for the blocking embedding calls; the client releases the GIL while
+# waiting on the network, so the requests overlap instead of running back to back
+_embedding_executor = ThreadPoolExecutor(max_workers=8)
+
+# Number of text embeddings kept per memory instance; embeddings are deterministic,
+# so a repeated query or description never needs a second API call
+EMBEDDING_CACHE_SIZE = 1024
+
 
 class LongMemory:
 
@@ -29,6 +40,9 @@ class LongMemory:
         }
 
         self.embedding_client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        self._embedding_cache = OrderedDict()
+        # embeddings are computed from worker threads too, see _embedding_executor
+        self._embedding_cache_lock = threading.Lock()
 
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.openai_client = OpenAI(
@@ -123,32 +137,37 @@ class LongMemory:
             logger.info("No memories should be added or updated")
             return
 
-        # update point in db
-        points = []
+        # drop malformed memories before paying for their embeddings
+        valid_memories = []
         for memory in new_memories:
-            topic = memory.get("topic")
-            desc = memory.get("description")
-            pid = memory.get("id") or uuid4().hex  # use provided id or generate new
-
-            if not topic or not desc:
+            if not memory.get("topic") or not memory.get("description"):
                 logger.warning("Skipping malformed memory: %r", memory)
                 continue
+            valid_memories.append(memory)
 
-            emb = None
-            try:
-                emb = self._get_embedding(desc)
-            except Exception:
-                logger.exception("Embedding failed for: %s", desc)
+        # embed all descriptions concurrently, keeping the memory order
+        embeddings = list(
+            _embedding_executor.map(
+                self._try_get_embedding,
+                [memory["description"] for memory in valid_memories],
+            )
+        )
+
+        # update point in db
+        points = []
+        for memory, emb in zip(valid_memories, embeddings):
+            if emb is None:
                 continue
 
+            pid = memory.get("id") or uuid4().hex  # use provided id or generate new
             points.append(
                 {
                     "id": pid,
                     "vector": emb,
                     "payload": {
                         "user_id": self.user_id,
-                        "topic": topic,
-                        "description": desc,
+                        "topic": memory["topic"],
+                        "description": memory["description"],
                         "ts": int(time.time()),
                     },
                 }
@@ -162,19 +181,39 @@ class LongMemory:
             resp.raise_for_status()
             logger.info("Upserted %d points (new+updated)", len(points))
 
+    def _try_get_embedding(self, text):
+        """Like _get_embedding, but log and return None on failure."""
+        try:
+            return self._get_embedding(text)
+        except Exception:
+            logger.exception("Embedding failed for: %s", text)
+            return None
+
     def _get_embedding(self, text):
-        """Call Google embed_content, return the embedding vector."""
+        """Call Google embed_content, return the embedding vector (cached per text)."""
+        with self._embedding_cache_lock:
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                self._embedding_cache.move_to_end(text)
+                return cached
+
         try:
             result = self.embedding_client.models.embed_content(
                 model="models/text-embedding-004",
                 contents=[text],
                 config=types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY"),
             )
-            return result.embeddings[0].values
+            embedding = result.embeddings[0].values
         except Exception:
             logger.exception("Failed to get embedding for text: %s", text)
             raise Exception("Failed to get embedding")
 
+        with self._embedding_cache_lock:
+            self._embedding_cache[text] = embedding
+            if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+        return embedding
+
     def get_memories(
         self, query: str, top_k: int = 5, max_cosine_distance: float = 0.7
     ):
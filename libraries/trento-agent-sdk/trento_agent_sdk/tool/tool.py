@@ -16,7 +16,7 @@ def _type_to_json_schema(py_type) -> str:
         return "number"
     elif py_type == bool:
         return "boolean"
-    elif py_type == list or py_type == List:
+    elif py_type == list or py_type == List or getattr(py_type, "__origin__", None) is list:
         return "array"
     elif py_type == dict or py_type == Dict:
         return "object"
@@ -48,6 +48,10 @@ def get_function_info(fn, name, description):
             "type": _type_to_json_schema(param_type),
             "description": "",  # Default empty description
         }
+        if param_info["type"] == "array":
+            item_types = getattr(param_type, "__args__", None)
+            if item_types:
+                param_info["items"] = {"type": _type_to_json_schema(item_types[0])}
 
         # Try to get description from docstring if available
         if fn.__doc__: